@@ -0,0 +1,149 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from processor import DocumentProcessor, SourceIndex, copy_to_quarantine, render_report
+
+
+class BatchJob:
+    """One mapping file (e.g. one department) to run against the shared source dir."""
+
+    def __init__(self, mapping_file, source_col, target_col, output_dir, name=None):
+        self.mapping_file = mapping_file
+        self.source_col = source_col
+        self.target_col = target_col
+        self.output_dir = output_dir
+        self.name = name or os.path.splitext(os.path.basename(mapping_file))[0]
+
+
+def merge_stats(stats_list):
+    """Combines the stats of several processors into one stats dict."""
+    combined = {
+        "total": 0,
+        "success": 0,
+        "failed": 0,
+        "skipped": 0,
+        "quarantined": 0,
+        "errors": {},
+        "client_counts": {}
+    }
+    for stats in stats_list:
+        for key in ("total", "success", "failed", "skipped", "quarantined"):
+            combined[key] += stats.get(key, 0)
+        for message, count in stats["errors"].items():
+            combined["errors"][message] = combined["errors"].get(message, 0) + count
+        for client_id, count in stats["client_counts"].items():
+            combined["client_counts"][client_id] = combined["client_counts"].get(client_id, 0) + count
+    combined["success_rate"] = (combined["success"] / combined["total"] * 100) if combined["total"] > 0 else 0
+    combined["top_clients"] = sorted(combined["client_counts"].items(), key=lambda item: item[1], reverse=True)[:10]
+    return combined
+
+
+class BatchProcessor:
+    """Runs several mapping jobs against one source dir.
+
+    The source dir is listed and indexed once (SourceIndex) and shared by all jobs, which run
+    concurrently. io_budget caps the number of copies in flight across all jobs together,
+    so extra jobs don't oversubscribe the source share.
+    Quarantine is done once for the whole batch: only entries no job matched end up in quarantine_dir.
+    It is skipped when a job failed. Jobs with the same name get the name of their output dir appended.
+    """
+
+    def __init__(self, source_dir, jobs, max_workers=4, io_budget=4, dry_run=False, quarantine_dir=None):
+        self.source_dir = source_dir
+        self.jobs = [job if isinstance(job, BatchJob) else BatchJob(*job) for job in jobs]
+        self._unique_names()
+        self.max_workers = max_workers
+        self.io_budget = io_budget
+        self.dry_run = dry_run
+        self.quarantine_dir = quarantine_dir
+        self.source_index = None
+        self.processors = []
+        self.job_errors = {}  # job name -> exception message
+        self.quarantine_skipped = False
+
+    def _unique_names(self):
+        # Job names key the reports and job_errors; departments often share a mapping file name
+        counts = {}
+        for job in self.jobs:
+            counts[job.name] = counts.get(job.name, 0) + 1
+        used = set()
+        for job in self.jobs:
+            name = job.name
+            if counts[name] > 1:
+                name = f"{name}_{os.path.basename(os.path.normpath(job.output_dir))}"
+            unique = name
+            number = 2
+            while unique in used:
+                unique = f"{name}_{number}"
+                number += 1
+            job.name = unique
+            used.add(unique)
+
+    def run(self, progress_callback=None):
+        """Processes all jobs. progress_callback(job_name, current, total) is called per row."""
+        self.source_index = SourceIndex(self.source_dir)
+        io_limiter = threading.Semaphore(self.io_budget)
+
+        self.processors = [
+            DocumentProcessor(
+                job.mapping_file, self.source_dir, job.output_dir, job.source_col, job.target_col,
+                dry_run=self.dry_run, source_index=self.source_index, io_limiter=io_limiter
+            )
+            for job in self.jobs
+        ]
+
+        def run_job(job, processor):
+            callback = None
+            if progress_callback:
+                callback = lambda current, total: progress_callback(job.name, current, total)
+            try:
+                processor.process(progress_callback=callback)
+            except Exception as e:
+                self.job_errors[job.name] = str(e)
+                processor.update_summary()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(run_job, job, processor) for job, processor in zip(self.jobs, self.processors)]
+                for future in futures:
+                    future.result()
+
+            if self.quarantine_dir and not self.dry_run:
+                if self.job_errors:
+                    # A failed job matched nothing, so its documents would all look unmatched
+                    self.quarantine_skipped = True
+                    print(f"Quarantaine overgeslagen: {len(self.job_errors)} job(s) mislukt")
+                else:
+                    self._quarantine_unmatched()
+        finally:
+            # Release the source zip archives (they stay locked on Windows while open)
+            self.source_index.close()
+
+        return self.processors
+
+    def _quarantine_unmatched(self):
+        matched = set()
+        for processor in self.processors:
+            matched |= processor.matched_items
+
+        copy_to_quarantine(self.source_dir, set(self.source_index) - matched, self.quarantine_dir, self.source_index)
+
+    def combined_stats(self):
+        return merge_stats([processor.stats for processor in self.processors])
+
+    def generate_reports(self, report_dir):
+        """Writes one report per job plus a combined report. Returns the report paths."""
+        os.makedirs(report_dir, exist_ok=True)
+        paths = []
+        combined_log = []
+        for job, processor in zip(self.jobs, self.processors):
+            report_path = os.path.join(report_dir, f"import_report_{job.name}.html")
+            job_errors = {job.name: self.job_errors[job.name]} if job.name in self.job_errors else None
+            paths.append(render_report(report_path, processor.stats, processor.audit_log, job_errors=job_errors))
+            combined_log.extend(dict(entry, job=job.name) for entry in processor.audit_log)
+
+        combined_path = os.path.join(report_dir, "import_report_combined.html")
+        paths.append(render_report(combined_path, self.combined_stats(), combined_log, show_job=True,
+                                   job_errors=self.job_errors))
+        return paths
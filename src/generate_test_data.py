@@ -1,121 +1,255 @@
 import pandas as pd
 import os
+import re
 import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-def generate_test_data():
-    base_dir = os.path.join(os.getcwd(), "test_data")
+SUBJECTS = ["Verwijsbrief", "Huisartsenbrief", "Behandelovereenkomst", "Toestemmingsformulier", "Intakeverslag"]
+EXTENSIONS = [".pdf", ".docx", ".png", ".jpg"]
+
+# Share of rows per scenario:
+# exact     - Excel has the full file name
+# fuzzy     - Excel has an ID, the file name contains it ("Doc_<id>_v1.pdf")
+# folder    - Excel has a folder name, the folder holds 1-3 files
+# ambiguous - Excel has an ID that is contained in two file names
+# missing   - Excel has a file name that does not exist on disk
+DEFAULT_RATIOS = {"exact": 0.25, "fuzzy": 0.25, "folder": 0.5, "ambiguous": 0.0, "missing": 0.0}
+
+# Excel sheets hold at most 1,048,576 rows (including the header)
+XLSX_MAX_ROWS = 1048575
+
+SHARED_BLOCK_SIZE = 1024 * 1024
+
+# Rows generated (and their files written) per chunk, which bounds memory on huge sets
+CHUNK_ROWS = 5000
+
+COLUMNS = ["ID", "ClientID", "DossierID", "Onderwerp", "Bestandsnaam", "Datumtijd"]
+
+
+def parse_size(text):
+    """Parses '500K', '2M', '1G' or a plain byte count."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", str(text), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Ongeldige grootte: {text}")
+    factor = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}[match.group(2).upper()]
+    return int(float(match.group(1)) * factor)
+
+
+def size_sampler(spec, rng):
+    """Returns a function drawing file sizes from spec.
+
+    '500K'            fixed size
+    '10K-1M'          uniform between the two sizes
+    'lognormal:200K'  log-normal around a median of 200K (sigma 1)
+    """
+    spec = str(spec)
+    if spec.lower().startswith("lognormal:"):
+        median = parse_size(spec.split(":", 1)[1])
+        return lambda: max(1, int(rng.lognormvariate(0, 1) * median))
+    if "-" in spec:
+        low, high = (parse_size(part) for part in spec.split("-", 1))
+        return lambda: rng.randint(low, high)
+    size = parse_size(spec)
+    return lambda: size
+
+
+def parse_ratios(text):
+    """Parses 'exact=0.25,fuzzy=0.25,folder=0.5' into a ratios dict (missing keys are 0)."""
+    ratios = {key: 0.0 for key in DEFAULT_RATIOS}
+    for part in text.split(","):
+        key, value = part.split("=")
+        key = key.strip()
+        if key not in ratios:
+            raise ValueError(f"Onbekend scenario: {key}")
+        ratios[key] = float(value)
+    return ratios
+
+
+def scenario_list(rows, ratios, rng):
+    """Returns a shuffled list with exactly round(ratio * rows) rows per scenario."""
+    if any(ratio < 0 for ratio in ratios.values()):
+        raise ValueError("Verhoudingen mogen niet negatief zijn")
+    total = sum(ratios.values())
+    if total <= 0:
+        raise ValueError("Minstens één verhouding moet groter dan 0 zijn")
+    scenarios = []
+    for name, ratio in ratios.items():
+        scenarios.extend([name] * int(round(rows * ratio / total)))
+    # Rounding can leave a few rows over or short; fill/trim with the largest scenario
+    largest = max(ratios, key=ratios.get)
+    scenarios = (scenarios + [largest] * rows)[:rows]
+    rng.shuffle(scenarios)
+    return scenarios
+
+
+def write_file(path, size, content, seed, shared_block):
+    with open(path, "wb") as f:
+        if content == "sparse":
+            # No data blocks are allocated, the file only reports its size
+            f.truncate(size)
+        elif content == "shared":
+            remaining = size
+            while remaining > 0:
+                chunk = shared_block[:min(remaining, len(shared_block))]
+                f.write(chunk)
+                remaining -= len(chunk)
+        else:
+            # Seeded per file so output is reproducible regardless of thread order
+            f.write(random.Random(seed).randbytes(size))
+
+
+def generate_test_data(base_dir=None, rows=1000, seed=None, ratios=None, file_size="500K", folder_file_size="100K",
+                       content="shared", workers=8, mapping_format="xlsx", clients=6,
+                       missing_client_rate=0.01, missing_filename_rate=0.01):
+    """Generates a mapping file plus matching source files and folders.
+
+    With the defaults this produces the classic 1,000 row set (half flat files, half folders).
+    content is 'shared' (one random block reused, fast), 'random' (unique data per file) or
+    'sparse' (no disk usage). Files are written by `workers` threads, CHUNK_ROWS rows at a
+    time; a csv mapping is written per chunk as well, so memory stays flat for millions of rows.
+    """
+    base_dir = base_dir or os.path.join(os.getcwd(), "test_data")
     source_dir = os.path.join(base_dir, "source_files")
     output_dir = os.path.join(base_dir, "output_files")
-    
-    # Clean up and recreate directories
-    if not os.path.exists(base_dir):
-        os.makedirs(base_dir)
-    
-    if not os.path.exists(source_dir):
-        os.makedirs(source_dir)
-        
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
-    # Sample data generation
-    data = []
-    subjects = ["Verwijsbrief", "Huisartsenbrief", "Behandelovereenkomst", "Toestemmingsformulier", "Intakeverslag"]
-    extensions = [".pdf", ".docx", ".png", ".jpg"]
-    
-    # Generate 1000 records
-    # 500 Flat files (Scenario 1)
-    # 500 Folders (Scenario 2)
-    
-    for i in range(1, 1001):
-        # Introduce some data errors
-        is_missing_client = random.random() < 0.01
-        is_missing_filename = random.random() < 0.01
-        
-        client_id = random.randint(1, 6) if not is_missing_client else None
-        dossier_id = 1
-        subject = random.choice(subjects) if random.random() > 0.3 else "" 
-        safe_subject = subject.replace(" ", "_") if subject else "document"
-        
-        date_val = datetime(2025, 5, 1) + timedelta(days=i)
-        
-        # Determine Scenario
-        is_folder_scenario = i > 500
-        
-        if is_folder_scenario:
-            # Scenario 2: Folder with files
-            # Excel contains the Folder Name (or ID that matches folder)
-            # Let's say Excel has "Dossier_<i>"
-            folder_name = f"Dossier_{i}"
-            excel_filename = folder_name if not is_missing_filename else None
-            
-            # Create folder on disk
-            folder_path = os.path.join(source_dir, folder_name)
-            if not os.path.exists(folder_path):
-                os.makedirs(folder_path)
-                
-            # Create 2-3 files inside
-            for j in range(random.randint(1, 3)):
-                sub_ext = random.choice(extensions)
-                sub_filename = f"{safe_subject}_{j}{sub_ext}"
-                sub_path = os.path.join(folder_path, sub_filename)
-                with open(sub_path, "wb") as f:
-                    f.write(os.urandom(1024 * 100)) # 100KB
-                    
-        else:
-            # Scenario 1: Flat file
-            # Excel contains "<i>_Subject.ext" OR just "<i>" if we want to test fuzzy matching?
-            # User said: "waarin ergens in de documentnaam een document- of cliëntnummer staat"
-            # Let's make the filename complex: "Scan_2025_Client_<i>_Subject.ext"
-            # And Excel just has "<i>" or the full name?
-            # Usually mapping files have the specific ID or Name.
-            # Let's stick to: Excel has "<i>" (ID) and file is "<i>_Subject.ext" to test fuzzy match?
-            # OR Excel has full filename.
-            # Let's try to mix it up.
-            # 1-250: Exact match
-            # 251-500: Fuzzy match (Excel has ID, file has ID in name)
-            
-            ext = random.choice(extensions)
-            
-            if i <= 250:
-                # Exact match
-                filename = f"{i}_{safe_subject}{ext}"
-                excel_filename = filename
+
+    # Create directories
+    os.makedirs(source_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+
+    if mapping_format == "xlsx" and rows > XLSX_MAX_ROWS:
+        raise ValueError(f"Excel ondersteunt maximaal {XLSX_MAX_ROWS} rijen; gebruik csv of parquet")
+
+    rng = random.Random(seed)
+    ratios = ratios or DEFAULT_RATIOS
+    scenarios = scenario_list(rows, ratios, rng)
+    file_size_of = size_sampler(file_size, rng)
+    folder_file_size_of = size_sampler(folder_file_size, rng)
+    # Zero-padded IDs so an ID is never a substring of another row's name
+    width = len(str(rows))
+
+    if mapping_format not in ("xlsx", "csv", "parquet"):
+        raise ValueError(f"Onbekend formaat: {mapping_format}")
+    mapping_path = os.path.join(base_dir, f"mapping.{mapping_format}")
+    if mapping_format == "csv":
+        # CSV is appended per chunk; Excel and Parquet are written once at the end
+        pd.DataFrame(columns=COLUMNS).to_csv(mapping_path, index=False)
+    frames = []
+
+    shared_block = random.Random(seed).randbytes(SHARED_BLOCK_SIZE) if content == "shared" else None
+    base_seed = seed if seed is not None else random.randrange(2 ** 32)
+    start_date = datetime(2025, 5, 1)
+    file_count = 0
+    folder_count = 0
+
+    def write_job(job):
+        number, (path, size) = job
+        write_file(path, size, content, base_seed * 1000003 + number, shared_block)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk_start in range(0, rows, CHUNK_ROWS):
+            columns = {name: [] for name in COLUMNS}
+            files = []  # (path, size)
+            folders = []
+
+            for i in range(chunk_start + 1, min(chunk_start + CHUNK_ROWS, rows) + 1):
+                scenario = scenarios[i - 1]
+                # Introduce some data errors
+                is_missing_client = rng.random() < missing_client_rate
+                is_missing_filename = rng.random() < missing_filename_rate
+
+                client_id = rng.randint(1, clients) if not is_missing_client else None
+                subject = rng.choice(SUBJECTS) if rng.random() > 0.3 else ""
+                safe_subject = subject.replace(" ", "_") if subject else "document"
+                token = f"{i:0{width}d}"
+                ext = rng.choice(EXTENSIONS)
+
+                if scenario == "folder":
+                    # Excel contains the folder name, the folder holds 1-3 files
+                    folder_name = f"Dossier_{token}"
+                    excel_filename = folder_name
+                    folder_path = os.path.join(source_dir, folder_name)
+                    folders.append(folder_path)
+                    for j in range(rng.randint(1, 3)):
+                        sub_filename = f"{safe_subject}_{j}{rng.choice(EXTENSIONS)}"
+                        files.append((os.path.join(folder_path, sub_filename), folder_file_size_of()))
+                elif scenario == "exact":
+                    excel_filename = f"{token}_{safe_subject}{ext}"
+                    files.append((os.path.join(source_dir, excel_filename), file_size_of()))
+                elif scenario == "fuzzy":
+                    # Excel has the ID, file is "Doc_<id>_v1.ext"
+                    excel_filename = f"N{token}"
+                    files.append((os.path.join(source_dir, f"Doc_N{token}_v1{ext}"), file_size_of()))
+                elif scenario == "ambiguous":
+                    # Two files contain the ID; the matcher has to pick one
+                    excel_filename = f"A{token}"
+                    files.append((os.path.join(source_dir, f"Scan_A{token}_a{ext}"), file_size_of()))
+                    files.append((os.path.join(source_dir, f"Scan_A{token}_b{ext}"), file_size_of()))
+                else:
+                    # Missing: listed in Excel, never written to disk
+                    excel_filename = f"Ontbreekt_{token}{ext}"
+
+                columns["ID"].append(i)
+                columns["ClientID"].append(client_id)
+                columns["DossierID"].append(1)
+                columns["Onderwerp"].append(subject)
+                columns["Bestandsnaam"].append(excel_filename if not is_missing_filename else None)
+                # Wrap around after ten years to stay within pandas' timestamp range on huge sets
+                columns["Datumtijd"].append(start_date + timedelta(days=i % 3650))
+
+            for folder_path in folders:
+                os.makedirs(folder_path, exist_ok=True)
+            # Only this chunk's writes are queued
+            list(executor.map(write_job, enumerate(files, file_count)))
+            file_count += len(files)
+            folder_count += len(folders)
+
+            # Nullable integers, so every chunk writes client IDs the same way
+            df = pd.DataFrame(columns).astype({"ClientID": "Int64"})
+            if mapping_format == "csv":
+                df.to_csv(mapping_path, index=False, header=False, mode="a")
             else:
-                # Fuzzy match: Excel has ID "<i>", File is "Doc_<i>_v1.pdf"
-                filename = f"Doc_{i}_v1{ext}"
-                excel_filename = str(i)
-            
-            excel_filename = excel_filename if not is_missing_filename else None
-            
-            # Create file
-            file_path = os.path.join(source_dir, filename)
-            with open(file_path, "wb") as f:
-                f.write(os.urandom(1024 * 500)) # 500KB
-
-        data.append({
-            "ID": i,
-            "ClientID": client_id,
-            "DossierID": dossier_id,
-            "Onderwerp": subject,
-            "Bestandsnaam": excel_filename,
-            "Datumtijd": date_val
-        })
-
-    # Create DataFrame 
-
-
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Save to Excel
-    excel_path = os.path.join(base_dir, "mapping.xlsx")
-    df.to_excel(excel_path, index=False)
-    
+                frames.append(df)
+
+    # Save mapping
+    if mapping_format != "csv":
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+        if mapping_format == "xlsx":
+            df.to_excel(mapping_path, index=False)
+        else:
+            df.to_parquet(mapping_path, index=False)
+
     print(f"Test data generated in {base_dir}")
-    print(f"- Excel: {excel_path}")
-    print(f"- Source Files: {source_dir}")
+    print(f"- Mapping: {mapping_path} ({rows} rijen)")
+    print(f"- Source Files: {source_dir} ({file_count} bestanden, {folder_count} mappen)")
     print(f"- Output Directory: {output_dir}")
+    return mapping_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genereer testdata voor de Document Importer")
+    parser.add_argument("--out", default=None, help="Doelmap (standaard ./test_data)")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--ratios", default=None, help="bijv. exact=0.25,fuzzy=0.25,folder=0.4,ambiguous=0.05,missing=0.05")
+    parser.add_argument("--file-size", default="500K", help="'500K', '10K-1M' of 'lognormal:200K'")
+    parser.add_argument("--folder-file-size", default="100K")
+    parser.add_argument("--content", choices=["shared", "random", "sparse"], default="shared")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--format", choices=["xlsx", "csv", "parquet"], default="xlsx")
+    parser.add_argument("--clients", type=int, default=6)
+    parser.add_argument("--missing-client-rate", type=float, default=0.01)
+    parser.add_argument("--missing-filename-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    generate_test_data(
+        base_dir=args.out, rows=args.rows, seed=args.seed,
+        ratios=parse_ratios(args.ratios) if args.ratios else None,
+        file_size=args.file_size, folder_file_size=args.folder_file_size, content=args.content,
+        workers=args.workers, mapping_format=args.format, clients=args.clients,
+        missing_client_rate=args.missing_client_rate, missing_filename_rate=args.missing_filename_rate
+    )
 
 if __name__ == "__main__":
-    generate_test_data()
+    main()
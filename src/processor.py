@@ -3,11 +3,349 @@ import shutil
 import pandas as pd
 import zipfile
 import re
+import json
+import time
+import threading
+import bisect
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from jinja2 import Template
 
+# Bump when the structure of plans written by save_plan changes
+PLAN_VERSION = 1
+
+REPORT_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="nl">
+<head>
+    <meta charset="UTF-8">
+    <title>Document Import Rapport</title>
+    <style>
+        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background-color: #f4f4f9; }
+        h1, h2 { color: #333; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; box-shadow: 0 0 10px rgba(0,0,0,0.1); border-radius: 8px; }
+        .summary-box { display: flex; gap: 20px; margin-bottom: 20px; }
+        .card { flex: 1; padding: 15px; border-radius: 5px; color: white; text-align: center; }
+        .bg-blue { background-color: #007bff; }
+        .bg-green { background-color: #28a745; }
+        .bg-red { background-color: #dc3545; }
+        .bg-orange { background-color: #fd7e14; }
+        table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+        th, td { padding: 10px; border: 1px solid #ddd; text-align: left; }
+        th { background-color: #f8f9fa; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        .status-success { color: green; font-weight: bold; }
+        .status-error { color: red; font-weight: bold; }
+        .status-skipped { color: orange; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Document Import Audit Rapport</h1>
+        <p>Gegenereerd op: {{ timestamp }}</p>
+
+        <h2>Samenvatting</h2>
+        <div class="summary-box">
+            <div class="card bg-blue">
+                <h3>{{ summary.total }}</h3>
+                <p>Totaal Verwerkt</p>
+            </div>
+            <div class="card bg-green">
+                <h3>{{ summary.success }}</h3>
+                <p>Succesvol</p>
+            </div>
+            <div class="card bg-red">
+                <h3>{{ summary.failed }}</h3>
+                <p>Mislukt</p>
+            </div>
+            <div class="card bg-orange">
+                <h3>{{ "%.1f"|format(summary.success_rate) }}%</h3>
+                <p>Succespercentage</p>
+            </div>
+        </div>
+
+        {% if job_errors %}
+        <h2>Mislukte jobs</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Job</th>
+                    <th>Foutmelding</th>
+                </tr>
+            </thead>
+            <tbody>
+                {% for job, error in job_errors.items() %}
+                <tr>
+                    <td>{{ job }}</td>
+                    <td class="status-error">{{ error }}</td>
+                </tr>
+                {% endfor %}
+            </tbody>
+        </table>
+        {% endif %}
+
+        <h2>Foutanalyse</h2>
+        {% if summary.error_counts %}
+        <table>
+            <thead>
+                <tr>
+                    <th>Foutmelding</th>
+                    <th>Aantal</th>
+                </tr>
+            </thead>
+            <tbody>
+                {% for error, count in summary.error_counts.items() %}
+                <tr>
+                    <td>{{ error }}</td>
+                    <td>{{ count }}</td>
+                </tr>
+                {% endfor %}
+            </tbody>
+        </table>
+        {% else %}
+        <p>Geen fouten gevonden.</p>
+        {% endif %}
+
+        <h2>Audit Log (Details)</h2>
+        <table>
+            <thead>
+                <tr>
+                    {% if show_job %}<th>Job</th>{% endif %}
+                    <th>Rij ID</th>
+                    <th>Bestandsnaam</th>
+                    <th>Cliënt ID</th>
+                    <th>Status</th>
+                    <th>Opmerking</th>
+                </tr>
+            </thead>
+            <tbody>
+                {% for log in audit_log %}
+                <tr>
+                    {% if show_job %}<td>{{ log.job }}</td>{% endif %}
+                    <td>{{ log.id }}</td>
+                    <td>{{ log.filename }}</td>
+                    <td>{{ log.client_id }}</td>
+                    <td class="{{ 'status-success' if log.status == 'SUCCESS' else ('status-error' if log.status == 'ERROR' else 'status-skipped') }}">{{ log.status }}</td>
+                    <td>{{ log.message }}</td>
+                </tr>
+                {% endfor %}
+            </tbody>
+        </table>
+    </div>
+</body>
+</html>
+"""
+
+
+def render_report(report_path, stats, audit_log, show_job=False, job_errors=None):
+    """Writes the HTML audit report for the given stats and audit log.
+
+    show_job adds a Job column (entries need a "job" key); job_errors lists jobs that failed.
+    """
+    template = Template(REPORT_TEMPLATE)
+    html_content = template.render(
+        timestamp=datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
+        summary=stats,
+        audit_log=audit_log,
+        show_job=show_job,
+        job_errors=job_errors or {}
+    )
+    
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(html_content)
+    return report_path
+
+
+def source_archives(source):
+    """Returns the zip archives to read when source is a .zip file or a list of them, else None."""
+    if isinstance(source, (list, tuple)):
+        if not source:
+            raise ValueError("Geen zip bestanden opgegeven als bron")
+        for path in source:
+            if not str(path).lower().endswith(".zip"):
+                raise ValueError(f"Bron is geen zip bestand: {path}")
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"Zip bestand niet gevonden: {path}")
+        return list(source)
+    if str(source).lower().endswith(".zip") and os.path.isfile(source):
+        return [source]
+    return None
+
+
+def extract_member(archive, info, dst):
+    """Streams one archive member to dst and gives it the member's timestamp (like copy2)."""
+    with archive.open(info) as fsrc, open(dst, "wb") as fdst:
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+    mtime = zip_mtime(info)
+    os.utime(dst, (mtime, mtime))
+
+
+def zip_mtime(info):
+    return time.mktime(info.date_time + (0, 0, -1))
+
+
+def copy_to_quarantine(source_dir, items, quarantine_dir, source_index=None):
+    """Copies the given top-level source entries into quarantine_dir.
+
+    For zip sources (source_index.members set) the members are extracted with their paths.
+    """
+    os.makedirs(quarantine_dir, exist_ok=True)
+    
+    for item in items:
+        src = os.path.join(str(source_dir), item)
+        dst = os.path.join(quarantine_dir, item)
+        try:
+            if source_index is not None and source_index.members is not None:
+                for archive_path, info in source_index.members.get(item, []):
+                    parts = info.filename.split("/")
+                    if ".." in parts or os.path.isabs(info.filename):
+                        # Never write outside the quarantine dir
+                        continue
+                    member_dst = os.path.join(quarantine_dir, *parts)
+                    os.makedirs(os.path.dirname(member_dst), exist_ok=True)
+                    extract_member(source_index.archives[archive_path], info, member_dst)
+            elif os.path.isfile(src):
+                shutil.copy2(src, dst)
+            elif os.path.isdir(src):
+                if os.path.exists(dst):
+                    shutil.rmtree(dst)
+                shutil.copytree(src, dst)
+        except Exception as e:
+            print(f"Failed to quarantine {item}: {e}")
+
+
+class SourceIndex:
+    """Inventory of the top-level files and folders in a source dir or in zip archives.
+
+    Built once and shareable between processors (see batch.py). Exact matches are a set lookup;
+    fuzzy (contains) matches search one joined string instead of looping over every name,
+    and their results are cached.
+    For zip sources the top-level member names are the entries: "Doc_1.pdf" is a file,
+    "Dossier_5/..." makes a folder entry "Dossier_5". Nothing is extracted while indexing.
+    """
+
+    def __init__(self, source_dir, items=None, archives=None):
+        self.source_dir = source_dir
+        # Open ZipFile objects by path, reused for streaming the matched members
+        self.archives = archives if archives is not None else {}
+        self.members = None  # item -> [(archive path, ZipInfo)] for zip sources
+        self.kinds = {}
+        archive_paths = source_archives(source_dir) if items is None else None
+        if archive_paths:
+            items = self._index_archives(archive_paths)
+        self.items = list(items) if items is not None else os.listdir(source_dir)
+        self._names = set(self.items)
+        # All names joined by NUL (never part of a file name); offsets map a hit back to its item
+        self._blob = "\0".join(self.items)
+        self._offsets = []
+        offset = 0
+        for item in self.items:
+            self._offsets.append(offset)
+            offset += len(item) + 1
+        self._cache = {}
+
+    def add(self, items):
+        """Appends new entries (e.g. files that arrived in watch mode) without rebuilding.
+
+        Earlier fuzzy hits stay valid because new entries come last; cached misses are dropped.
+        """
+        for item in items:
+            if item in self._names:
+                continue
+            self._offsets.append(len(self._blob) + 1 if self.items else 0)
+            self._blob = f"{self._blob}\0{item}" if self.items else item
+            self.items.append(item)
+            self._names.add(item)
+        self._cache = {name: found for name, found in self._cache.items() if found is not None}
+
+    def _index_archives(self, archive_paths):
+        self.members = {}
+        for archive_path in archive_paths:
+            if archive_path not in self.archives:
+                self.archives[archive_path] = zipfile.ZipFile(archive_path)
+            for info in self.archives[archive_path].infolist():
+                if info.is_dir():
+                    continue
+                item, sep, rest = info.filename.partition("/")
+                kind = "folder" if sep else "file"
+                if item in self.kinds and (kind == "file" or self.kinds[item] == "file"):
+                    # Same name in several archives: the first one wins
+                    continue
+                self.kinds[item] = kind
+                self.members.setdefault(item, []).append((archive_path, info))
+        return list(self.members)
+
+    def close(self):
+        """Closes the zip archives opened for this index (releases the file locks on Windows)."""
+        for archive in self.archives.values():
+            archive.close()
+        self.archives.clear()
+
+    def kind(self, item):
+        """Returns "file", "folder" or None (entry vanished)."""
+        if self.members is not None:
+            return self.kinds.get(item)
+        path = os.path.join(self.source_dir, item)
+        if os.path.isfile(path):
+            return "file"
+        if os.path.isdir(path):
+            return "folder"
+        return None
+
+    def files(self, item):
+        """Yields every file of an entry as a dict with src, member, name, size, mtime and ino.
+
+        member is the archive member name for zip sources (src is then the archive path).
+        ino orders reads: the inode on disk, the member offset inside an archive.
+        """
+        if self.members is not None:
+            for archive_path, info in self.members.get(item, []):
+                yield {"src": archive_path, "member": info.filename, "name": info.filename.rsplit("/", 1)[-1],
+                       "size": info.file_size, "mtime": zip_mtime(info), "ino": info.header_offset}
+            return
+        path = os.path.join(self.source_dir, item)
+        if os.path.isfile(path):
+            yield self._file_entry(path, item)
+            return
+        for root, dirs, files in os.walk(path):
+            for file in files:
+                yield self._file_entry(os.path.join(root, file), file)
+
+    def _file_entry(self, path, name):
+        st = os.stat(path)
+        return {"src": path, "member": None, "name": name, "size": st.st_size, "mtime": st.st_mtime, "ino": st.st_ino}
+
+    def item_size(self, item):
+        return sum(entry["size"] for entry in self.files(item))
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self._names
+
+    def find(self, doc_name):
+        """Returns the exact match for doc_name, else the first entry containing it, else None."""
+        doc_name = str(doc_name)
+        if doc_name in self._names:
+            return doc_name
+        if doc_name in self._cache:
+            return self._cache[doc_name]
+        found = None
+        pos = self._blob.find(doc_name) if doc_name else -1
+        if pos >= 0:
+            found = self.items[bisect.bisect_right(self._offsets, pos) - 1]
+        self._cache[doc_name] = found
+        return found
+
+
 class DocumentProcessor:
-    def __init__(self, mapping_file, source_dir, output_dir, source_col, target_col, dry_run=False, quarantine=False):
+    def __init__(self, mapping_file, source_dir, output_dir, source_col, target_col, dry_run=False, quarantine=False,
+                 source_index=None, io_limiter=None, locality_schedule=False):
         self.mapping_file = mapping_file
         self.source_dir = source_dir
         self.output_dir = output_dir
@@ -15,7 +353,19 @@ class DocumentProcessor:
         self.target_col = target_col
         self.dry_run = dry_run
         self.quarantine = quarantine
+        # Optional shared SourceIndex and semaphore limiting concurrent copies (batch runs)
+        self.source_index = source_index
+        self.io_limiter = io_limiter
+        # Copy in source locality order instead of mapping row order (see execute_plan)
+        self.locality_schedule = locality_schedule
+        # Open source zip archives (shared with the SourceIndex that opened them)
+        self._archives = source_index.archives if source_index is not None else {}
+        self._archive_lock = threading.Lock()
+        self.matched_items = set()
         self.audit_log = []
+        # Row index -> position in audit_log, so a re-processed row replaces its entry in place
+        self._entry_positions = {}
+        self._reuse_positions = {}
         self.stats = {
             "total": 0,
             "success": 0,
@@ -62,303 +412,647 @@ class DocumentProcessor:
             return s[:-2]
         return s
 
-    def process(self, progress_callback=None):
+    def load_mapping(self):
+        """Reads the mapping file (Excel, or CSV/Parquet for very large sets) into a DataFrame."""
         if not os.path.exists(self.mapping_file):
             raise FileNotFoundError("Mapping file not found")
+        ext = os.path.splitext(self.mapping_file)[1].lower()
+        if ext == ".csv":
+            return pd.read_csv(self.mapping_file)
+        if ext == ".parquet":
+            return pd.read_parquet(self.mapping_file)
+        return pd.read_excel(self.mapping_file)
+
+    def index_source(self):
+        """Returns the SourceIndex of the source dir (the shared one if given)."""
+        if self.source_index is not None:
+            return self.source_index
+        return SourceIndex(self.source_dir, archives=self._archives)
+
+    def find_item(self, doc_name, disk_items):
+        """Returns the source entry matching doc_name, or None.
+
+        1. Exact match, 2. fuzzy match (entry name contains doc_name); ambiguous matches pick the first.
+        """
+        return disk_items.find(doc_name)
+
+    def _io(self):
+        return self.io_limiter if self.io_limiter is not None else contextlib.nullcontext()
+
+    def process(self, progress_callback=None):
+        """Plans the whole mapping and executes the plan (or only records it when dry_run).
+
+        progress_callback(current, total) covers both phases: planning fills the first half
+        of the range and copying the second half (a dry run only plans, over the full range).
+        """
+        plan_progress = progress_callback
+        execute_progress = None
+        if progress_callback and not self.dry_run:
+            plan_progress = lambda current, total: progress_callback(current, total * 2)
+            execute_progress = lambda current, total: progress_callback(total + current, total * 2)
+
+        try:
+            plan = self.build_plan(progress_callback=plan_progress)
+            if self.dry_run:
+                self.record_dry_run(plan)
+            else:
+                self.execute_plan(plan, progress_callback=execute_progress)
+        finally:
+            self.close()
+
+    def close(self):
+        """Closes zip archives this processor opened as source.
+
+        process() does this itself; call it (or use the processor as a context manager) after
+        build_plan/execute_plan. Archives of a shared source_index belong to its owner.
+        """
+        if self.source_index is not None:
+            return
+        with self._archive_lock:
+            for archive in self._archives.values():
+                archive.close()
+            self._archives.clear()
+
+    def __enter__(self):
+        return self
 
-        df = pd.read_excel(self.mapping_file)
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def build_plan(self, progress_callback=None, zip_max_size=1024*1024*1024):
+        """Resolves every mapping row into copy operations without copying anything.
+
+        The returned plan is a plain (JSON serializable) dict with the resolved rows, their
+        copy operations and sizes, the unmatched entries for quarantine, the predicted zip
+        volumes and a free-space check against the output volume. See save_plan/execute_plan.
+        """
+        df = self.load_mapping()
         
         # Index files and folders
-        # We create a map of "normalized_name" -> "real_name"
-        # And also keep a list of all real names for fuzzy search
-        disk_items = os.listdir(self.source_dir)
-        matched_items = set()
+        disk_items = self.index_source()
+        matched_items = self.matched_items
+        state = self._new_plan_state()
+        rows = []
         
         total_rows = len(df)
         
         for index, row in df.iterrows():
             if progress_callback:
                 progress_callback(index + 1, total_rows)
+            rows.append(self.plan_row(index, row, disk_items, matched_items, state))
 
-            self.stats["total"] += 1
-            row_id = row.get("ID", index + 1)
-            raw_doc_name = row.get(self.source_col)
-            raw_client_id = row.get(self.target_col)
-            
-            # Use smarter extraction for Client ID (handles "Client 123" -> "123")
-            client_id = self.extract_id(raw_client_id)
-            # Use sanitization for Doc Name (handles "Doc/Name" -> "DocName")
-            doc_name = self.sanitize_filename(self.normalize_val(raw_doc_name))
+        quarantine_items = []
+        if self.quarantine:
+            quarantine_items = sorted(set(disk_items) - matched_items)
+
+        plan = {
+            "version": PLAN_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "mapping_file": self.mapping_file,
+            "source_dir": self.source_dir,
+            "output_dir": self.output_dir,
+            "rows": rows,
+            "quarantine_items": quarantine_items,
+        }
+        plan["summary"] = self._summarize_plan(plan, zip_max_size, disk_items)
+        return plan
+
+    def _new_plan_state(self):
+        # planned: destination path -> source path of every copy planned so far
+        # existing: client folder -> names already on disk (listed once per client)
+        return {"planned": {}, "existing": {}}
+
+    def _exists(self, state, client_id, dst_file):
+        if dst_file in state["planned"]:
+            return True
+        if client_id not in state["existing"]:
+            target_path = os.path.join(self.output_dir, client_id)
+            state["existing"][client_id] = set(os.listdir(target_path)) if os.path.isdir(target_path) else set()
+        return os.path.basename(dst_file) in state["existing"][client_id]
+
+    def plan_row(self, index, row, disk_items, matched_items, state=None, replace=None):
+        """Resolves a single mapping row into a row plan (dict) without touching the output.
+
+        replace maps source keys to the destinations this row copied them to before (watch mode);
+        those destinations are updated in place when the source changed instead of being skipped.
+        """
+        if state is None:
+            state = self._new_plan_state()
+        row_id = row.get("ID", index + 1)
+        if hasattr(row_id, "item"):
+            # numpy scalar from pandas -> plain Python value for JSON
+            row_id = row_id.item()
+        raw_doc_name = row.get(self.source_col)
+        raw_client_id = row.get(self.target_col)
+        
+        # Use smarter extraction for Client ID (handles "Client 123" -> "123")
+        client_id = self.extract_id(raw_client_id)
+        # Use sanitization for Doc Name (handles "Doc/Name" -> "DocName")
+        doc_name = self.sanitize_filename(self.normalize_val(raw_doc_name))
+        
+        row_plan = {
+            "index": int(index),
+            "id": row_id,
+            "filename": str(doc_name) if doc_name else "N/A",
+            "client_id": str(client_id) if client_id else "N/A",
+            "item": None,
+            "kind": None,
+            "status": "PLANNED",
+            "message": "",
+            "ops": [],
+            # Source key -> destination for files this row copied before that are unchanged
+            "kept": {}
+        }
+
+        if not doc_name:
+            return self._plan_error(row_plan, "Bestandsnaam ontbreekt of ongeldig in Excel")
+
+        if not client_id:
+            return self._plan_error(row_plan, "Cliënt ID ontbreekt of ongeldig in Excel")
+
+        found_item = self.find_item(doc_name, disk_items)
+        
+        if not found_item:
+            return self._plan_error(row_plan, f"Niet gevonden: {doc_name}")
+
+        matched_items.add(found_item)
+        row_plan["item"] = found_item
+
+        try:
+            target_path = os.path.join(self.output_dir, client_id)
+            kind = disk_items.kind(found_item)
             
-            log_entry = {
-                "id": row_id,
-                "filename": str(doc_name) if doc_name else "N/A",
-                "client_id": str(client_id) if client_id else "N/A",
-                "status": "PENDING",
-                "message": ""
-            }
-
-            if not doc_name:
-                self._log_error(log_entry, "Bestandsnaam ontbreekt of ongeldig in Excel")
+            if kind == "file":
+                # Scenario 1: Single File
+                row_plan["kind"] = "file"
+                dst_file = os.path.join(target_path, found_item)
+                entries = list(disk_items.files(found_item))
+                if replace and entries and self.source_key(entries[0]) in replace:
+                    self._plan_replace(row_plan, state, entries[0], replace[self.source_key(entries[0])])
+                elif self._exists(state, client_id, dst_file):
+                    row_plan["status"] = "SKIPPED"
+                    row_plan["message"] = f"Bestand bestaat al: {found_item}"
+                else:
+                    for entry in entries:
+                        self._plan_copy(row_plan, state, entry, dst_file)
+                    
+            elif kind == "folder":
+                # Scenario 2: Folder
+                row_plan["kind"] = "folder"
+                for entry in disk_items.files(found_item):
+                    d_file = os.path.join(target_path, entry["name"]) # Flattening
+                    source_key = self.source_key(entry)
+                    if replace and source_key in replace:
+                        self._plan_replace(row_plan, state, entry, replace[source_key])
+                        continue
+                    
+                    # Handle duplicate names when flattening. A file with the same name can come
+                    # from another folder, so only this row's own copies (replace) count as done.
+                    if self._exists(state, client_id, d_file):
+                        base, ext = os.path.splitext(entry["name"])
+                        d_file = os.path.join(target_path, f"{base}_{row_id}{ext}")
+                    
+                    self._plan_copy(row_plan, state, entry, d_file)
+        except Exception as e:
+            return self._plan_error(row_plan, f"Systeemfout: {str(e)}")
+
+        return row_plan
+
+    def source_key(self, entry):
+        """Identifies a source file: its path, or 'archive::member' for zip sources."""
+        if entry.get("member"):
+            return f"{entry['src']}::{entry['member']}"
+        return entry["src"]
+
+    def _plan_copy(self, row_plan, state, entry, dst):
+        state["planned"][dst] = self.source_key(entry)
+        # The inode is kept for locality scheduling (see _schedule_ops)
+        op = {"src": entry["src"], "dst": dst, "size": entry["size"], "ino": entry["ino"]}
+        if entry["member"]:
+            op["member"] = entry["member"]
+        row_plan["ops"].append(op)
+        return op
+
+    def _plan_replace(self, row_plan, state, entry, dst):
+        if os.path.exists(dst) and self._same_file(entry, dst):
+            state["planned"][dst] = self.source_key(entry)
+            row_plan["kept"][self.source_key(entry)] = dst
+            return
+        self._plan_copy(row_plan, state, entry, dst)["replace"] = True
+
+    def _plan_error(self, row_plan, message):
+        row_plan["status"] = "ERROR"
+        row_plan["message"] = message
+        return row_plan
+
+    def _summarize_plan(self, plan, zip_max_size, disk_items):
+        client_bytes = {}
+        files = 0
+        for row_plan in plan["rows"]:
+            for op in row_plan["ops"]:
+                files += 1
+                client_bytes[row_plan["client_id"]] = client_bytes.get(row_plan["client_id"], 0) + op["size"]
+        copy_bytes = sum(client_bytes.values())
+
+        quarantine_bytes = sum(disk_items.item_size(item) for item in plan["quarantine_items"])
+
+        # Zip volumes are made from everything in the output dir, so include what is already there
+        folder_sizes = dict(client_bytes)
+        if quarantine_bytes:
+            folder_sizes["_QUARANTINE"] = folder_sizes.get("_QUARANTINE", 0) + quarantine_bytes
+        if os.path.isdir(self.output_dir):
+            for name in os.listdir(self.output_dir):
+                path = os.path.join(self.output_dir, name)
+                if os.path.isdir(path):
+                    folder_sizes[name] = folder_sizes.get(name, 0) + self._get_dir_size(path)
+        volumes = [
+            {"name": self._zip_name(batch), "clients": len(batch), "bytes": size}
+            for batch, size in self._split_volumes(folder_sizes, zip_max_size)
+        ]
+
+        # Free space on the volume holding the output dir (nearest existing parent)
+        probe = os.path.abspath(self.output_dir)
+        while not os.path.exists(probe) and os.path.dirname(probe) != probe:
+            probe = os.path.dirname(probe)
+        free_bytes = shutil.disk_usage(probe).free
+        required = copy_bytes + quarantine_bytes
+        # Zips are stored uncompressed in the worst case
+        required_with_zips = required + sum(v["bytes"] for v in volumes)
+
+        return {
+            "rows": len(plan["rows"]),
+            "planned_rows": sum(1 for r in plan["rows"] if r["status"] == "PLANNED"),
+            "skipped_rows": sum(1 for r in plan["rows"] if r["status"] == "SKIPPED"),
+            "error_rows": sum(1 for r in plan["rows"] if r["status"] == "ERROR"),
+            "files": files,
+            "bytes": copy_bytes,
+            "clients": len(client_bytes),
+            "quarantine_items": len(plan["quarantine_items"]),
+            "quarantine_bytes": quarantine_bytes,
+            "zip_max_size": zip_max_size,
+            "zip_volumes": volumes,
+            "free_bytes": free_bytes,
+            "required_bytes": required,
+            "required_bytes_with_zips": required_with_zips,
+            "fits": required <= free_bytes,
+            "fits_with_zips": required_with_zips <= free_bytes,
+        }
+
+    def save_plan(self, plan, plan_path):
+        with open(plan_path, "w", encoding="utf-8") as f:
+            json.dump(plan, f, ensure_ascii=False, indent=1)
+        return plan_path
+
+    def load_plan(self, plan_path):
+        with open(plan_path, "r", encoding="utf-8") as f:
+            plan = json.load(f)
+        if plan.get("version") != PLAN_VERSION:
+            raise ValueError(f"Onbekende plan versie: {plan.get('version')}")
+        return plan
+
+    def record_dry_run(self, plan):
+        """Fills the audit log and stats from a plan without copying."""
+        for row_plan in plan["rows"]:
+            log_entry = self._new_entry(row_plan)
+            if row_plan["status"] == "ERROR":
+                self._log_error(log_entry, row_plan["message"])
                 continue
+            if row_plan["status"] == "SKIPPED":
+                log_entry["status"] = "SKIPPED"
+                log_entry["message"] = row_plan["message"]
+                self.stats["skipped"] += 1
+            else:
+                log_entry["status"] = "DRY_RUN"
+                log_entry["message"] = self._success_message(row_plan, len(row_plan["ops"]))
+                self.stats["success"] += 1
+            self._count_client(log_entry)
+            self._append_entry(log_entry)
+        self.update_summary()
+
+    def execute_plan(self, plan, workers=1, progress_callback=None, schedule=None):
+        """Executes a (saved) plan: copies its operations and quarantines unmatched entries.
+
+        No matching happens here. Rows are copied by `workers` threads, but the audit log
+        and stats are still recorded in the original row order. With schedule (default:
+        self.locality_schedule) the copies run in source locality order, grouped per client.
+        The plan must have been made for this processor's source and output dir (ValueError).
+        """
+        self._check_plan_dirs(plan)
+        if schedule is None:
+            schedule = self.locality_schedule
+        rows = plan["rows"]
+        total_rows = len(rows)
+        if schedule:
+            results = self._copy_scheduled(rows, workers, progress_callback)
+            for row_plan, result in zip(rows, results):
+                self._record_row(row_plan, result)
+        elif workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(self._copy_row, rows)
+                for done, (row_plan, result) in enumerate(zip(rows, results), 1):
+                    if progress_callback:
+                        progress_callback(done, total_rows)
+                    self._record_row(row_plan, result)
+        else:
+            for done, row_plan in enumerate(rows, 1):
+                if progress_callback:
+                    progress_callback(done, total_rows)
+                self._record_row(row_plan, self._copy_row(row_plan))
+
+        if plan["quarantine_items"]:
+            self._quarantine_unmatched(plan["quarantine_items"], set())
+        self.update_summary()
+
+    def _check_plan_dirs(self, plan):
+        # Copy ops hold the plan's absolute paths, quarantine and zips use self.*_dir
+        def location(path):
+            paths = path if isinstance(path, (list, tuple)) else [path]
+            return [os.path.normcase(os.path.abspath(p)) for p in paths]
+
+        if location(plan["source_dir"]) != location(self.source_dir):
+            raise ValueError(f"Plan hoort bij een andere bronmap: {plan['source_dir']}")
+        if location(plan["output_dir"]) != location(self.output_dir):
+            raise ValueError(f"Plan hoort bij een andere doelmap: {plan['output_dir']}")
 
-            if not client_id:
-                self._log_error(log_entry, "Cliënt ID ontbreekt of ongeldig in Excel")
+    def _schedule_ops(self, rows):
+        """Groups the copy operations of all planned rows per client folder.
+
+        Within a group the copies are ordered by source directory and inode, and the groups
+        are ordered by their first source, so reads sweep the source tree and writes stay
+        together per client folder. Returns a list of groups of (row position, op).
+        """
+        groups = {}
+        for pos, row_plan in enumerate(rows):
+            if row_plan["status"] != "PLANNED":
                 continue
+            group = groups.setdefault(row_plan["client_id"], [])
+            for op in row_plan["ops"]:
+                group.append((pos, op))
 
-            # Search Logic
-            found_item = None
-            
-            # 1. Exact Match
-            if doc_name in disk_items:
-                found_item = doc_name
+        def locality(entry):
+            op = entry[1]
+            return (os.path.dirname(op["src"]), op.get("ino", 0), op["src"])
+
+        for group in groups.values():
+            group.sort(key=locality)
+        return sorted((group for group in groups.values() if group), key=lambda group: locality(group[0]))
+
+    def _copy_scheduled(self, rows, workers, progress_callback=None):
+        """Copies all planned operations in locality order. Returns one result per row.
+
+        progress_callback(done, total_rows) counts finished rows, like the unscheduled path.
+        """
+        results = [[0, 0, None] for _ in rows]
+        groups = self._schedule_ops(rows)
+        total_rows = len(rows)
+        # Ops still to do per row; rows without ops are finished right away
+        remaining = [0] * total_rows
+        for group in groups:
+            for pos, op in group:
+                remaining[pos] += 1
+        done = [sum(1 for count in remaining if count == 0)]
+        progress_lock = threading.Lock()
+
+        def row_finished():
+            with progress_lock:
+                done[0] += 1
+                if progress_callback:
+                    progress_callback(done[0], total_rows)
+
+        def copy_group(group):
+            # A row belongs to exactly one client, so groups never share a result
+            for pos, op in group:
+                result = results[pos]
+                if not result[2]:
+                    try:
+                        if self._copy_op(op):
+                            result[0] += 1
+                        else:
+                            result[1] += 1
+                    except Exception as e:
+                        result[2] = f"Systeemfout: {str(e)}"
+                remaining[pos] -= 1
+                if remaining[pos] == 0:
+                    row_finished()
+
+        if progress_callback and done[0]:
+            progress_callback(done[0], total_rows)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            list(executor.map(copy_group, groups))
+
+        for row_plan in rows:
+            if row_plan["status"] == "PLANNED" and row_plan["kind"] == "folder":
+                os.makedirs(os.path.join(self.output_dir, row_plan["client_id"]), exist_ok=True)
+        return [tuple(result) for result in results]
+
+    def process_row(self, index, row, disk_items, matched_items):
+        """Plans and executes a single mapping row. Returns its audit log entry."""
+        return self.execute_row(self.plan_row(index, row, disk_items, matched_items))
+
+    def execute_row(self, row_plan):
+        """Executes (or, when dry_run, only records) a single row plan. Returns its audit log entry."""
+        if self.dry_run:
+            self.record_dry_run({"rows": [row_plan]})
+            return self.audit_log[self._entry_positions[row_plan["index"]]]
+        return self._record_row(row_plan, self._copy_row(row_plan))
+
+    def _copy_row(self, row_plan):
+        """Copies the operations of one row plan. Returns (copied, skipped, error)."""
+        if row_plan["status"] != "PLANNED":
+            return 0, 0, None
+        copied = 0
+        skipped = 0
+        try:
+            for op in row_plan["ops"]:
+                if self._copy_op(op):
+                    copied += 1
+                else:
+                    skipped += 1
+            if row_plan["kind"] == "folder":
+                os.makedirs(os.path.join(self.output_dir, row_plan["client_id"]), exist_ok=True)
+        except Exception as e:
+            return copied, skipped, f"Systeemfout: {str(e)}"
+        return copied, skipped, None
+
+    def _copy_op(self, op):
+        """Copies one planned operation. Returns False when the destination already exists."""
+        # Never overwrite: the output may have changed since the plan was made.
+        # Only ops marked "replace" (a changed source this row copied before) update their copy.
+        if os.path.exists(op["dst"]) and not op.get("replace"):
+            return False
+        os.makedirs(os.path.dirname(op["dst"]), exist_ok=True)
+        # A replacement is written next to the old copy first, so that one stays intact on failure
+        dst = op["dst"] + ".part" if op.get("replace") else op["dst"]
+        with self._io():
+            if op.get("member"):
+                # Zip source: stream the member straight to the client folder
+                archive = self._open_archive(op["src"])
+                extract_member(archive, archive.getinfo(op["member"]), dst)
             else:
-                # 2. Fuzzy Match (contains)
-                # Look for item that contains doc_name
-                # Prefer exact containment
-                matches = [item for item in disk_items if str(doc_name) in item]
-                if len(matches) == 1:
-                    found_item = matches[0]
-                elif len(matches) > 1:
-                    # Ambiguous? Pick first or log warning?
-                    # Let's pick the shortest one (closest match?) or just the first
-                    found_item = matches[0] 
-                    # Maybe log that we did a fuzzy match?
-            
-            if not found_item:
-                self._log_error(log_entry, f"Niet gevonden: {doc_name}")
-                continue
+                shutil.copy2(op["src"], dst)
+        if op.get("replace"):
+            os.replace(dst, op["dst"])
+        return True
 
-            matched_items.add(found_item)
+    def _open_archive(self, archive_path):
+        with self._archive_lock:
+            if archive_path not in self._archives:
+                self._archives[archive_path] = zipfile.ZipFile(archive_path)
+            return self._archives[archive_path]
 
-            # Process Found Item
-            try:
-                target_path = os.path.join(self.output_dir, client_id)
-                if not self.dry_run:
-                    os.makedirs(target_path, exist_ok=True)
-                
-                src_path = os.path.join(self.source_dir, found_item)
-                
-                if os.path.isfile(src_path):
-                    # Scenario 1: Single File
-                    dst_file = os.path.join(target_path, found_item)
-                    if os.path.exists(dst_file) and not self.dry_run:
-                         log_entry["status"] = "SKIPPED"
-                         log_entry["message"] = f"Bestand bestaat al: {found_item}"
-                         self.stats["skipped"] += 1
-                    else:
-                        if not self.dry_run:
-                            shutil.copy2(src_path, dst_file)
-                        log_entry["status"] = "SUCCESS" if not self.dry_run else "DRY_RUN"
-                        log_entry["message"] = f"Bestand {'zou worden' if self.dry_run else ''} gekopieerd: {found_item}"
-                        self.stats["success"] += 1
-                        
-                elif os.path.isdir(src_path):
-                    # Scenario 2: Folder
-                    copied_count = 0
-                    for root, dirs, files in os.walk(src_path):
-                        for file in files:
-                            s_file = os.path.join(root, file)
-                            d_file = os.path.join(target_path, file) # Flattening
-                            
-                            # Handle duplicate names if flattening?
-                            if os.path.exists(d_file) and not self.dry_run:
-                                base, ext = os.path.splitext(file)
-                                d_file = os.path.join(target_path, f"{base}_{row_id}{ext}")
-                            
-                            if not self.dry_run:
-                                shutil.copy2(s_file, d_file)
-                            copied_count += 1
-                            
-                    log_entry["status"] = "SUCCESS" if not self.dry_run else "DRY_RUN"
-                    log_entry["message"] = f"Map {'zou worden' if self.dry_run else ''} verwerkt: {found_item} ({copied_count} bestanden)"
-                    self.stats["success"] += 1
-
-                self.stats["client_counts"][client_id] = self.stats["client_counts"].get(client_id, 0) + 1
-                
-            except Exception as e:
-                self._log_error(log_entry, f"Systeemfout: {str(e)}")
-
-            self.audit_log.append(log_entry)
-
-        # Handle Quarantine (Unmatched files)
-        if self.quarantine and not self.dry_run:
-            quarantine_dir = os.path.join(self.output_dir, "_QUARANTINE")
-            os.makedirs(quarantine_dir, exist_ok=True)
-            
-            unmatched_items = set(disk_items) - matched_items
-            for item in unmatched_items:
-                src = os.path.join(self.source_dir, item)
-                dst = os.path.join(quarantine_dir, item)
-                try:
-                    if os.path.isfile(src):
-                        shutil.copy2(src, dst)
-                    elif os.path.isdir(src):
-                        if os.path.exists(dst):
-                            shutil.rmtree(dst)
-                        shutil.copytree(src, dst)
-                except Exception as e:
-                    print(f"Failed to quarantine {item}: {e}")
+    def _record_row(self, row_plan, result):
+        copied, skipped, error = result
+        log_entry = self._new_entry(row_plan)
+        if row_plan["status"] == "ERROR" or error:
+            self._log_error(log_entry, error or row_plan["message"])
+            return log_entry
+
+        if row_plan["status"] == "SKIPPED" or (row_plan["kind"] == "file" and skipped):
+            log_entry["status"] = "SKIPPED"
+            log_entry["message"] = f"Bestand bestaat al: {row_plan['item']}"
+            self.stats["skipped"] += 1
+        else:
+            log_entry["status"] = "SUCCESS"
+            log_entry["message"] = self._success_message(row_plan, copied)
+            self.stats["success"] += 1
+        self._count_client(log_entry)
+        self._append_entry(log_entry)
+        return log_entry
+
+    def _new_entry(self, row_plan):
+        self.stats["total"] += 1
+        log_entry = {
+            "index": row_plan["index"],
+            "id": row_plan["id"],
+            "filename": row_plan["filename"],
+            "client_id": row_plan["client_id"],
+            "status": "PENDING",
+            "message": ""
+        }
+        if row_plan["item"]:
+            log_entry["item"] = row_plan["item"]
+        return log_entry
+
+    def _success_message(self, row_plan, count):
+        verb = "zou worden" if self.dry_run else ""
+        if row_plan["kind"] == "folder":
+            return f"Map {verb} verwerkt: {row_plan['item']} ({count} bestanden)"
+        return f"Bestand {verb} gekopieerd: {row_plan['item']}"
 
+    def _count_client(self, log_entry):
+        client_id = log_entry["client_id"]
+        self.stats["client_counts"][client_id] = self.stats["client_counts"].get(client_id, 0) + 1
+
+    def _same_file(self, entry, path):
+        st = os.stat(path)
+        return entry["size"] == st.st_size and int(entry["mtime"]) == int(st.st_mtime)
+
+    def _quarantine_unmatched(self, disk_items, matched_items):
+        quarantine_dir = os.path.join(self.output_dir, "_QUARANTINE")
+        source_index = None
+        if source_archives(self.source_dir):
+            source_index = self.index_source()
+        copy_to_quarantine(self.source_dir, set(disk_items) - matched_items, quarantine_dir, source_index)
+
+    def update_summary(self):
+        """Recomputes the derived stats (success rate, top clients)."""
         self.stats["success_rate"] = (self.stats["success"] / self.stats["total"] * 100) if self.stats["total"] > 0 else 0
         self.stats["top_clients"] = sorted(self.stats["client_counts"].items(), key=lambda item: item[1], reverse=True)[:10]
 
+    def forget_entry(self, entry):
+        """Reverts the contribution of an audit log entry to the stats.
+
+        Used when a row is processed again (e.g. in watch mode) so stats stay cumulative
+        without counting the same row twice. The next entry recorded for the same row
+        replaces this one in place.
+        """
+        index = entry.get("index")
+        pos = self._entry_positions.get(index)
+        if pos is not None and self.audit_log[pos] is entry:
+            self._reuse_positions[index] = pos
+        self.stats["total"] -= 1
+        status = entry["status"]
+        if status == "ERROR":
+            self.stats["failed"] -= 1
+            message = entry["message"]
+            self.stats["errors"][message] = self.stats["errors"].get(message, 1) - 1
+            if self.stats["errors"][message] <= 0:
+                del self.stats["errors"][message]
+            return
+        if status in ("SUCCESS", "DRY_RUN"):
+            self.stats["success"] -= 1
+        elif status == "SKIPPED":
+            self.stats["skipped"] -= 1
+        client_id = entry["client_id"]
+        if client_id in self.stats["client_counts"]:
+            self.stats["client_counts"][client_id] -= 1
+            if self.stats["client_counts"][client_id] <= 0:
+                del self.stats["client_counts"][client_id]
+
     def _log_error(self, entry, message):
         entry["status"] = "ERROR"
         entry["message"] = message
         self.stats["errors"][message] = self.stats["errors"].get(message, 0) + 1
         self.stats["failed"] += 1
-        self.audit_log.append(entry)
+        self._append_entry(entry)
+
+    def _append_entry(self, entry):
+        # A row processed again takes the place of its forgotten entry, keeping row order
+        index = entry.get("index")
+        pos = self._reuse_positions.pop(index, None)
+        if pos is None:
+            self._entry_positions[index] = len(self.audit_log)
+            self.audit_log.append(entry)
+        else:
+            self.audit_log[pos] = entry
 
     def generate_report(self, report_path):
-        template_str = """
-        <!DOCTYPE html>
-        <html lang="nl">
-        <head>
-            <meta charset="UTF-8">
-            <title>Document Import Rapport</title>
-            <style>
-                body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background-color: #f4f4f9; }
-                h1, h2 { color: #333; }
-                .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; box-shadow: 0 0 10px rgba(0,0,0,0.1); border-radius: 8px; }
-                .summary-box { display: flex; gap: 20px; margin-bottom: 20px; }
-                .card { flex: 1; padding: 15px; border-radius: 5px; color: white; text-align: center; }
-                .bg-blue { background-color: #007bff; }
-                .bg-green { background-color: #28a745; }
-                .bg-red { background-color: #dc3545; }
-                .bg-orange { background-color: #fd7e14; }
-                table { width: 100%; border-collapse: collapse; margin-top: 20px; }
-                th, td { padding: 10px; border: 1px solid #ddd; text-align: left; }
-                th { background-color: #f8f9fa; }
-                tr:nth-child(even) { background-color: #f9f9f9; }
-                .status-success { color: green; font-weight: bold; }
-                .status-error { color: red; font-weight: bold; }
-                .status-skipped { color: orange; font-weight: bold; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Document Import Audit Rapport</h1>
-                <p>Gegenereerd op: {{ timestamp }}</p>
-
-                <h2>Samenvatting</h2>
-                <div class="summary-box">
-                    <div class="card bg-blue">
-                        <h3>{{ summary.total }}</h3>
-                        <p>Totaal Verwerkt</p>
-                    </div>
-                    <div class="card bg-green">
-                        <h3>{{ summary.success }}</h3>
-                        <p>Succesvol</p>
-                    </div>
-                    <div class="card bg-red">
-                        <h3>{{ summary.failed }}</h3>
-                        <p>Mislukt</p>
-                    </div>
-                    <div class="card bg-orange">
-                        <h3>{{ "%.1f"|format(summary.success_rate) }}%</h3>
-                        <p>Succespercentage</p>
-                    </div>
-                </div>
-
-                <h2>Foutanalyse</h2>
-                {% if summary.error_counts %}
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Foutmelding</th>
-                            <th>Aantal</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for error, count in summary.error_counts.items() %}
-                        <tr>
-                            <td>{{ error }}</td>
-                            <td>{{ count }}</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-                {% else %}
-                <p>Geen fouten gevonden.</p>
-                {% endif %}
-
-                <h2>Audit Log (Details)</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Rij ID</th>
-                            <th>Bestandsnaam</th>
-                            <th>Cliënt ID</th>
-                            <th>Status</th>
-                            <th>Opmerking</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for log in audit_log %}
-                        <tr>
-                            <td>{{ log.id }}</td>
-                            <td>{{ log.filename }}</td>
-                            <td>{{ log.client_id }}</td>
-                            <td class="{{ 'status-success' if log.status == 'SUCCESS' else ('status-error' if log.status == 'ERROR' else 'status-skipped') }}">{{ log.status }}</td>
-                            <td>{{ log.message }}</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-        </body>
-        </html>
-        """
-        
-        template = Template(template_str)
-        html_content = template.render(
-            timestamp=datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
-            summary=self.stats,
-            audit_log=self.audit_log
-        )
-        
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-        return report_path
+        return render_report(report_path, self.stats, self.audit_log)
 
     def create_zips(self, max_size_bytes=1024*1024*1024): # 1GB default
         # Get all client folders
         client_folders = [f for f in os.listdir(self.output_dir) if os.path.isdir(os.path.join(self.output_dir, f))]
+        folder_sizes = {client_id: self._get_dir_size(os.path.join(self.output_dir, client_id)) for client_id in client_folders}
         
-        # Sort numerically if possible, else string sort
+        zip_files_created = []
+        for batch, batch_size in self._split_volumes(folder_sizes, max_size_bytes):
+            zip_files_created.append(self._zip_batch(batch))
+            
+        return zip_files_created
+
+    def _split_volumes(self, folder_sizes, max_size_bytes):
+        """Groups client folders (name -> bytes) into zip volumes of at most max_size_bytes.
+
+        Returns a list of (client_ids, bytes). A single client larger than the limit gets its own volume.
+        """
+        # Sort numerically if possible, else string sort (numbers first)
         def sort_key(x):
             try:
-                return int(x)
+                return (0, int(x), "")
             except ValueError:
-                return x
-        
-        client_folders.sort(key=sort_key)
+                return (1, 0, x)
         
         current_batch = []
         current_batch_size = 0
-        zip_files_created = []
+        volumes = []
 
-        for client_id in client_folders:
-            client_path = os.path.join(self.output_dir, client_id)
-            client_size = self._get_dir_size(client_path)
+        for client_id in sorted(folder_sizes, key=sort_key):
+            client_size = folder_sizes[client_id]
             
-            # If adding this client exceeds max size AND we have a batch, zip the current batch
+            # If adding this client exceeds max size AND we have a batch, close the current batch
             if current_batch and (current_batch_size + client_size > max_size_bytes):
-                zip_path = self._zip_batch(current_batch)
-                zip_files_created.append(zip_path)
+                volumes.append((current_batch, current_batch_size))
                 current_batch = []
                 current_batch_size = 0
             
             current_batch.append(client_id)
             current_batch_size += client_size
             
-        # Zip remaining
+        # Remaining
         if current_batch:
-            zip_path = self._zip_batch(current_batch)
-            zip_files_created.append(zip_path)
+            volumes.append((current_batch, current_batch_size))
             
-        return zip_files_created
+        return volumes
 
     def _get_dir_size(self, path):
         total = 0
@@ -369,16 +1063,15 @@ class DocumentProcessor:
                     total += os.path.getsize(fp)
         return total
 
+    def _zip_name(self, client_ids):
+        return f"Export_Clients_{client_ids[0]}_to_{client_ids[-1]}.zip"
+
     def _zip_batch(self, client_ids):
         if not client_ids:
             return None
             
-        # Determine name range
-        first = client_ids[0]
-        last = client_ids[-1]
-        
-        # If numeric, we can make it look nice
-        zip_name = f"Export_Clients_{first}_to_{last}.zip"
+        # Name by client range
+        zip_name = self._zip_name(client_ids)
         zip_path = os.path.join(self.output_dir, zip_name) # Wait, user said output to output dir? 
         # "Ik wil dat je de output vervolgens zipt." 
         # Usually zips are placed alongside the output folder or inside it?
@@ -0,0 +1,64 @@
+import os
+import sys
+import shutil
+import filecmp
+from rich.console import Console
+from generate_test_data import generate_test_data
+from processor import DocumentProcessor
+from watcher import DocumentWatcher
+
+# Configuration
+BASE_DIR = os.path.join(os.getcwd(), "test_watch_data")
+SOURCE_DIR = os.path.join(BASE_DIR, "source_files")
+PROCESS_DIR = os.path.join(BASE_DIR, "output_process")
+WATCH_DIR = os.path.join(BASE_DIR, "output_watch")
+SOURCE_COL = "Bestandsnaam"
+TARGET_COL = "ClientID"
+
+console = Console()
+
+def list_output(output_dir):
+    files = set()
+    for root, dirs, names in os.walk(output_dir):
+        for name in names:
+            files.add(os.path.relpath(os.path.join(root, name), output_dir))
+    return files
+
+def run_test(rows=1000, seed=42):
+    """Checks that the watcher's initial pass writes the same output as process()."""
+    console.print("[bold blue]--- Watch-modus vs process() ---[/bold blue]")
+
+    if os.path.exists(BASE_DIR):
+        shutil.rmtree(BASE_DIR)
+    # One fixed size and few clients: many same-named folder files that only differ in content
+    mapping_file = generate_test_data(base_dir=BASE_DIR, rows=rows, seed=seed, mapping_format="csv",
+                                      file_size="2K", folder_file_size="2K", content="random", clients=3)
+    for output_dir in (PROCESS_DIR, WATCH_DIR):
+        os.makedirs(output_dir)
+
+    processor = DocumentProcessor(mapping_file, SOURCE_DIR, PROCESS_DIR, SOURCE_COL, TARGET_COL)
+    processor.process()
+
+    watch_processor = DocumentProcessor(mapping_file, SOURCE_DIR, WATCH_DIR, SOURCE_COL, TARGET_COL)
+    DocumentWatcher(watch_processor, use_inotify=False).process_delta()
+
+    expected = list_output(PROCESS_DIR)
+    actual = list_output(WATCH_DIR)
+    different = sorted(name for name in expected & actual
+                       if not filecmp.cmp(os.path.join(PROCESS_DIR, name), os.path.join(WATCH_DIR, name),
+                                          shallow=False))
+
+    console.print(f"process(): {len(expected)} bestanden, watch: {len(actual)} bestanden")
+    for name in sorted(expected - actual):
+        console.print(f"[red]Ontbreekt in watch: {name}[/red]")
+    for name in sorted(actual - expected):
+        console.print(f"[red]Extra in watch: {name}[/red]")
+    for name in different:
+        console.print(f"[red]Andere inhoud: {name}[/red]")
+
+    ok = expected == actual and not different and processor.stats["success"] == watch_processor.stats["success"]
+    console.print("[bold green]OK[/bold green]" if ok else "[bold red]VERSCHIL[/bold red]")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if run_test() else 1)
@@ -0,0 +1,352 @@
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+
+from processor import SourceIndex, source_archives
+
+# inotify constants (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatch:
+    """Minimal inotify wrapper (Linux only) on top of libc via ctypes."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}  # wd -> (path, tags)
+
+    def add(self, path, tag=None):
+        """Watches path. Watching a path twice returns the same wd, which then carries both tags."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        if wd in self.watches:
+            self.watches[wd][1].add(tag)
+        else:
+            self.watches[wd] = (path, {tag})
+        return wd
+
+    def read(self, timeout):
+        """Waits up to timeout seconds and returns a list of (path, tag, name, mask).
+
+        An event on a path watched with several tags is returned once per tag.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Kernel queue overflowed (wd -1): events were lost, caller must rescan
+                events.append((None, "overflow", "", mask))
+            elif wd in self.watches:
+                path, tags = self.watches[wd]
+                events.extend((path, tag, os.fsdecode(name), mask) for tag in tags)
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class DocumentWatcher:
+    """Keeps a DocumentProcessor running and processes only what changed.
+
+    New or changed entries in the source dir and rows appended to the mapping file are
+    collected (inotify on Linux, polling elsewhere), debounced, and processed as one batch.
+    Stats and audit log of the processor stay cumulative across batches; a changed source file
+    updates the copy this row made earlier. Polling compares a signature per top-level entry
+    that, for folders, covers the files inside them (one walk per poll); inotify only
+    re-examines the entries it reported.
+    A mapping file inside the source dir is watched as the mapping, never as a source entry.
+    Quarantine is not applied in watch mode: an unmatched file may still get a mapping row later.
+    """
+
+    def __init__(self, processor, poll_interval=2.0, debounce=1.0, report_path=None, use_inotify=True):
+        if source_archives(processor.source_dir):
+            raise ValueError("Watch-modus werkt alleen met een bronmap, niet met zip bestanden")
+        self.processor = processor
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.report_path = report_path
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        # The mapping file may live in the source dir; it is never a source item itself
+        self.mapping_item = None
+        mapping_dir = os.path.dirname(os.path.abspath(processor.mapping_file))
+        if os.path.normcase(mapping_dir) == os.path.normcase(os.path.abspath(processor.source_dir)):
+            self.mapping_item = os.path.basename(processor.mapping_file)
+
+        self.df = None
+        self.rows_done = 0
+        self.mapping_state = None
+        self.source_state = {}     # item -> signature (see _signature)
+        self.disk_items = None     # SourceIndex, kept up to date between batches
+        self.row_entries = {}      # row index -> audit log entry
+        self.row_copies = {}       # row index -> {source key: destination} copied by that row
+        self.item_rows = {}        # source item -> set of row indexes that matched it
+        self.unmatched_rows = set()  # rows that failed with "Niet gevonden"
+        self.matched_items = set()
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _signature(self, item):
+        """(mtime_ns, size) of a file; for a folder also the file count, total size and
+        newest mtime of everything inside, so nested rewrites are noticed. None if gone."""
+        path = os.path.join(self.processor.source_dir, item)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isdir(path):
+            return (st.st_mtime_ns, st.st_size)
+        count = 0
+        total = 0
+        newest = st.st_mtime_ns
+        for root, dirs, files in os.walk(path):
+            for name in dirs:
+                try:
+                    newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+                except OSError:
+                    continue
+            for name in files:
+                try:
+                    nested = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                newest = max(newest, nested.st_mtime_ns)
+                count += 1
+                total += nested.st_size
+        return (newest, st.st_size, count, total)
+
+    def _scan_source(self):
+        return {item: sig for item in os.listdir(self.processor.source_dir)
+                if item != self.mapping_item and (sig := self._signature(item)) is not None}
+
+    def _apply_changes(self, changed_items):
+        """Returns the previous source state with only changed_items re-examined."""
+        state = dict(self.source_state)
+        for item in changed_items:
+            if item == self.mapping_item:
+                continue
+            sig = self._signature(item)
+            if sig is None:
+                state.pop(item, None)
+            else:
+                state[item] = sig
+        return state
+
+    def process_delta(self, changed_items=None, new_state=None):
+        """Processes new mapping rows and rows affected by changed source entries.
+
+        changed_items is the set of top-level source entries known to have changed (inotify);
+        only those are re-examined. When None the source dir is rescanned (or new_state, an
+        already made scan, is used) and compared with the previous state.
+        Returns the number of rows (re)processed.
+        """
+        if changed_items is not None:
+            new_state = self._apply_changes(changed_items)
+        elif new_state is None:
+            new_state = self._scan_source()
+        old_state = self.source_state
+        changed = {i for i in set(new_state) | set(old_state) if new_state.get(i) != old_state.get(i)}
+        added_items = [i for i in new_state if i not in old_state]
+        removed_items = [i for i in old_state if i not in new_state]
+        self.source_state = new_state
+
+        if self.disk_items is None or removed_items:
+            self.disk_items = SourceIndex(self.processor.source_dir, items=new_state)
+        elif added_items:
+            self.disk_items.add(added_items)
+
+        mapping_state = self._stat(self.processor.mapping_file)
+        if mapping_state != self.mapping_state or self.df is None:
+            self.df = self.processor.load_mapping()
+            self.mapping_state = mapping_state
+            if len(self.df) < self.rows_done:
+                # Mapping file was replaced by a shorter one; start over on the new rows
+                self.rows_done = 0
+
+        rows = set(range(self.rows_done, len(self.df)))
+        for item in changed:
+            # Removed entries keep their earlier result; their copies are still there
+            if item in new_state:
+                rows |= self.item_rows.get(item, set())
+        if added_items:
+            # A new entry can satisfy rows that were not found earlier
+            rows |= self.unmatched_rows
+
+        for index in sorted(rows):
+            self._process_row(index, self.disk_items)
+        self.rows_done = len(self.df)
+
+        if rows:
+            self.processor.update_summary()
+            if self.report_path:
+                self.processor.generate_report(self.report_path)
+        return len(rows)
+
+    def _process_row(self, index, disk_items):
+        previous = self.row_entries.get(index)
+        if previous is not None:
+            self.processor.forget_entry(previous)
+            item = previous.get("item")
+            if item in self.item_rows:
+                self.item_rows[item].discard(index)
+        self.unmatched_rows.discard(index)
+
+        row = self.df.iloc[index]
+        copies = self.row_copies.get(index, {})
+        row_plan = self.processor.plan_row(index, row, disk_items, self.matched_items, replace=copies)
+        entry = self.processor.execute_row(row_plan)
+        self.row_entries[index] = entry
+        if entry["status"] != "ERROR":
+            copies = dict(copies)
+            copies.update(row_plan["kept"])
+            copies.update((self.processor.source_key(op), op["dst"]) for op in row_plan["ops"])
+            self.row_copies[index] = copies
+        item = entry.get("item")
+        if item:
+            self.item_rows.setdefault(item, set()).add(index)
+        elif entry["message"].startswith("Niet gevonden"):
+            self.unmatched_rows.add(index)
+
+    def run(self, stop_event=None, callback=None):
+        """Runs until stop_event is set. callback(rows_processed) is called after each batch."""
+        count = self.process_delta()
+        if callback:
+            callback(count)
+
+        watch = None
+        if self.use_inotify:
+            try:
+                watch = self._start_inotify()
+            except (OSError, AttributeError):
+                watch = None
+
+        try:
+            while stop_event is None or not stop_event.is_set():
+                if watch:
+                    seen, changed = self._wait_inotify(watch, stop_event)
+                    if not seen:
+                        continue
+                    count = self.process_delta(changed)
+                else:
+                    new_state = self._wait_poll(stop_event)
+                    if new_state is None:
+                        continue
+                    count = self.process_delta(new_state=new_state)
+                if callback and count:
+                    callback(count)
+        finally:
+            if watch:
+                watch.close()
+
+    def _start_inotify(self):
+        watch = InotifyWatch()
+        watch.add(self.processor.source_dir)
+        watch.add(os.path.dirname(os.path.abspath(self.processor.mapping_file)), tag="mapping")
+        for item in os.listdir(self.processor.source_dir):
+            if item != self.mapping_item:
+                self._watch_tree(watch, item)
+        return watch
+
+    def _watch_tree(self, watch, item):
+        path = os.path.join(self.processor.source_dir, item)
+        if not os.path.isdir(path):
+            return
+        for root, dirs, files in os.walk(path):
+            watch.add(root, tag=item)
+
+    def _wait_inotify(self, watch, stop_event):
+        """Collects events until they have been quiet for debounce seconds.
+
+        Returns (seen, changed): changed is the set of changed top-level source items,
+        or None when events were lost (queue overflow) and a full rescan is needed.
+        """
+        mapping_name = os.path.basename(self.processor.mapping_file)
+        changed = set()
+        seen = False
+        overflow = False
+        timeout = self.poll_interval
+        while True:
+            events = watch.read(timeout)
+            if not events:
+                break
+            for path, tag, name, mask in events:
+                if tag == "overflow":
+                    seen = overflow = True
+                    continue
+                if tag == "mapping":
+                    if name == mapping_name:
+                        seen = True
+                    continue
+                item = tag if tag else name
+                if item == self.mapping_item:
+                    # Handled by the "mapping" tag of the same watch
+                    continue
+                seen = True
+                changed.add(item)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # New (sub)folder: watch it too so files dropped into it are noticed
+                    self._watch_tree(watch, item)
+            if stop_event is not None and stop_event.is_set():
+                break
+            timeout = self.debounce
+        return seen, (None if overflow else changed)
+
+    def _sleep(self, seconds, stop_event):
+        if stop_event is not None:
+            stop_event.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _wait_poll(self, stop_event):
+        """Polls until something changed and then stayed unchanged for debounce seconds.
+
+        Returns the settled source state, or None when nothing changed.
+        """
+        self._sleep(self.poll_interval, stop_event)
+        state = (self._scan_source(), self._stat(self.processor.mapping_file))
+        if state == (self.source_state, self.mapping_state):
+            return None
+        while stop_event is None or not stop_event.is_set():
+            self._sleep(self.debounce, stop_event)
+            new_state = (self._scan_source(), self._stat(self.processor.mapping_file))
+            if new_state == state:
+                break
+            state = new_state
+        return state[0]